@@ -1,153 +1,236 @@
+import csv
+import importlib.util
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from google.colab import files  # Importing Google Colab's files module for uploads
+try:
+    from google.colab import files  # Importing Google Colab's files module for uploads
+    IN_COLAB = True
+except ImportError:
+    IN_COLAB = False  # Running locally: read inputs from and write outputs to the working directory
+
+# pyarrow's multithreaded read_csv engine is used when installed, without importing it here
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+# xlsxwriter is much faster than openpyxl for write-only output; None lets pandas pick its default engine
+EXCEL_ENGINE = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') else None
+
+# Explicit column dtypes (and date parsing) for each input file, so read_csv skips type inference
+INPUT_READ_OPTIONS = {
+    "ip_1": dict(dtype={'roll_no': 'string', 'sem': 'int16', 'course': 'category'}),
+    "ip_2": dict(dtype={'course': 'string', 'exam_time': 'category'},
+                 parse_dates=['exam_date'], date_format='%d/%m/%Y'),
+    "ip_3": dict(dtype={'room_name': 'string', 'capacity': 'int32', 'block': 'category'}),
+    "ip_4": dict(dtype={'roll_no': 'string', 'student_name': 'string'}),
+}
+
+# Column order of the (Date, Day, course, room, count, roll list) rows in a seating plan
+SEATING_PLAN_COLUMNS = ['Date', 'Day', 'course_code', 'Room', 'Allocated_students_count', 'Roll_list']
 
 
 def read_inputs():
     """
-    Handles file uploads in Google Colab and reads them into DataFrames.
+    Reads the input files into DataFrames, via file uploads when running in Google Colab.
     """
     try:
-        uploaded_files = files.upload()  # Allow user to upload files in Colab
-
-        # Dynamically load files based on uploaded filenames
-        ip_1 = pd.read_csv(next((file for file in uploaded_files if "ip_1" in file), None))
-        ip_2 = pd.read_csv(next((file for file in uploaded_files if "ip_2" in file), None))
-        ip_3 = pd.read_csv(next((file for file in uploaded_files if "ip_3" in file), None))
-        ip_4 = pd.read_csv(next((file for file in uploaded_files if "ip_4" in file), None))
-
+        if IN_COLAB:
+            uploaded_files = files.upload()  # Allow user to upload files in Colab
+            # Dynamically load files based on uploaded filenames
+            paths = [next((file for file in uploaded_files if name in file), None) for name in INPUT_READ_OPTIONS]
+        else:
+            paths = [f"{name}.csv" for name in INPUT_READ_OPTIONS]
+
+        ip_1, ip_2, ip_3, ip_4 = (pd.read_csv(path, engine=CSV_ENGINE, **options)
+                                  for path, options in zip(paths, INPUT_READ_OPTIONS.values()))
         return ip_1, ip_2, ip_3, ip_4
     except Exception as e:
         print(f"Error: {e}")
         return None, None, None, None
 
-    except Exception as e:
-        print(f"Error: {e}")
-        return None, None, None, None
-
-def save_seating_plan(seating_plan):
+def save_seating_plan(seating_plan, output_csv="seating_plan.csv", output_excel=None, offer_download=False):
     """
-    Save the seating plan in CSV and Excel formats.
+    Save the seating plan as CSV, plus Excel when output_excel is given, optionally offering the files for download in Colab.
     """
-    seating_df = pd.DataFrame(seating_plan)
+    # Save as CSV (semicolon-separated, as requested), streaming the rows straight to disk
+    with open(output_csv, 'w', newline='') as f:
+        writer = csv.writer(f, delimiter=';', lineterminator='\n', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(SEATING_PLAN_COLUMNS)
+        writer.writerows(seating_plan)
+    saved_files = [output_csv]
 
-    # Save as CSV (semicolon-separated, as requested)
-    seating_csv_filename = "seating_plan.csv"
-    seating_df.to_csv(seating_csv_filename, sep=';', index=False)
+    # Save as Excel only on demand (raises ImportError if no Excel writer is installed)
+    if output_excel is not None:
+        seating_df = pd.DataFrame.from_records(seating_plan, columns=SEATING_PLAN_COLUMNS)
+        seating_df.to_excel(output_excel, index=False, engine=EXCEL_ENGINE)
+        saved_files.append(output_excel)
 
-    # Save as Excel
-    seating_excel_filename = "seating_plan.xlsx"
-    seating_df.to_excel(seating_excel_filename, index=False)
+    print("Files saved:\n" + "\n".join(f"- {file}" for file in saved_files))
 
-    print(f"Files saved:\n- {seating_csv_filename}\n- {seating_excel_filename}")
+    # Offer files for download (only possible in Colab)
+    if offer_download and IN_COLAB:
+        for file in saved_files:
+            files.download(file)
 
-    # Offer files for download
-    files.download(seating_csv_filename)
-    files.download(seating_excel_filename)
-
-
-def allocate_seating_with_optimization(ip_1, ip_2, ip_3, buffer_size=5, seating_type='dense'):
-    # Function remains unchanged
-    seating_plan = []  # List to store the seating arrangement for each room
-    course_groups = ip_1.groupby('course')  # Grouping students by their course
-    sorted_courses = course_groups.size().sort_values(ascending=False).index  # Sorting courses by size (largest first)
-    room_groups = ip_3.groupby('block')  # Grouping rooms by their blocks (e.g., Block 9, LT)
 
-    prioritized_blocks = ['Block 9', 'LT']  # Blocks to prioritize when assigning rooms
-    room_allocation_by_date = {}  # Dictionary to track room usage for each date
-
-    for course in sorted_courses:
-        students = course_groups.get_group(course).reset_index(drop=True)  # Get all students for the current course
-        num_students = len(students)  # Number of students in the current course
+def _assign(course_sizes, course_dates, room_codes, room_capacities, num_dates, num_rooms, sparse):
+    """
+    Greedy room assignment over integer arrays.
 
-        # Get the exam date for the course
-        exam_date = ip_2.loc[ip_2['course'] == course, 'exam_date'].values
-        if len(exam_date) == 0:
+    Courses are visited in the given order and each fills the prioritized rooms (room_codes, with
+    buffer-adjusted room_capacities) in turn. Courses with a negative date code are skipped.
+    Returns one (course index, room code, first student offset, student count) row per assignment.
+    """
+    # A room visit that does not finish a course leaves the room full (dense) or halves what it has left (sparse),
+    # so each (date, room) holds at most splits_per_room such assignments besides one final assignment per course
+    splits_per_room = 1
+    if sparse:
+        max_capacity = room_capacities.max() if room_capacities.size else 0
+        while max_capacity >= 2:
+            max_capacity -= max_capacity // 2
+            splits_per_room += 1
+    max_assignments = min(course_sizes.size * room_codes.size,
+                          course_sizes.size + num_dates * room_codes.size * splits_per_room)
+    assignments = np.empty((max_assignments, 4), dtype=np.int64)
+    allocated = np.zeros((num_dates, num_rooms), dtype=np.int32)  # Students allocated per (date, room)
+    num_assignments = 0
+
+    # A course may take all of a room's remaining seats with dense seating, half of them with sparse seating
+    seat_share = 2 if sparse else 1
+    # Number of rooms per date that still have usable seats
+    open_rooms = np.full(num_dates, np.sum(room_capacities // seat_share > 0), dtype=np.int64)
+
+    for c in range(course_sizes.size):
+        date = course_dates[c]
+        if date < 0:
             continue  # If no exam date is found, skip this course
+        if open_rooms[date] == 0:
+            continue  # Every room is already full on this exam date
+
+        num_students = course_sizes[c]
+        offset = 0  # Index of the first student not yet assigned a room
+        for j in range(room_codes.size):
+            room = room_codes[j]
+
+            # Skip this room if it has no usable seats left for this exam date
+            usable_seats = (room_capacities[j] - allocated[date, room]) // seat_share
+            if usable_seats <= 0:
+                continue
+
+            max_course_capacity = min(usable_seats, num_students)
+
+            if max_course_capacity > 0:
+                assignments[num_assignments, 0] = c
+                assignments[num_assignments, 1] = room
+                assignments[num_assignments, 2] = offset
+                assignments[num_assignments, 3] = max_course_capacity
+                num_assignments += 1
+
+                allocated[date, room] += max_course_capacity  # Mark the seats as filled for the day
+                usable_left = (room_capacities[j] - allocated[date, room]) // seat_share
+                if usable_left <= 0:
+                    open_rooms[date] -= 1  # This room cannot take anyone else on this date
+                offset += max_course_capacity
+                num_students -= max_course_capacity
 
-        exam_date = datetime.strptime(exam_date[0], '%d/%m/%Y').date()  # Convert to datetime object
-
-        # Ensure the date exists in the room allocation tracking
-        if exam_date not in room_allocation_by_date:
-            room_allocation_by_date[exam_date] = {room_name: 0 for room_name in ip_3['room_name']}  # Initialize room availability (empty) for this date
-
-        # Allocate rooms for the current course based on the available rooms and the date
-        for block in prioritized_blocks:
-            if block not in room_groups.groups:
-                continue  # Skip this block if it has no rooms
-
-            rooms_in_block = room_groups.get_group(block).sort_values(by='capacity', ascending=False)  # Sort rooms by capacity
-
-            for _, room in rooms_in_block.iterrows():  # Iterating over each room in the sorted block
-                room_name = room['room_name']  # Room name
-                room_capacity = room['capacity'] - buffer_size  # Adjust for buffer size
-
-                # Check the current number of students allocated to this room for the current exam date
-                allocated_students = room_allocation_by_date[exam_date][room_name]
-
-                # Skip this room if it's already full for this exam date
-                if allocated_students >= room_capacity:
-                    continue
-
-                # Determine how many more students this room can accommodate
-                remaining_capacity = room_capacity - allocated_students
-
-                # Determine maximum capacity for each course based on seating type
-                if seating_type == 'dense':
-                    max_course_capacity = min(remaining_capacity, num_students)  # Full capacity for dense seating
-                elif seating_type == 'sparse':
-                    max_course_capacity = min(remaining_capacity // 2, num_students)  # Half capacity for sparse seating
-                else:
-                    raise ValueError("Invalid seating type. Choose 'dense' or 'sparse'.")
-
-                if max_course_capacity > 0:
-                    # Assign students to the room up to the maximum allowed by the seating type
-                    assigned_students = students.iloc[:max_course_capacity]  # Assign up to the max capacity
-                    # Format the roll numbers as a semicolon-separated string
-                    roll_list = ';'.join(assigned_students['roll_no'].astype(str))
-                    seating_plan.append({
-                        'Date': exam_date.strftime('%d/%m/%Y'),  # Format date as DD/MM/YYYY
-                        'Day': exam_date.strftime('%A'),  # Get the day of the week
-                        'course_code': course,
-                        'Room': room_name,
-                        'Allocated_students_count': len(assigned_students),
-                        'Roll_list': roll_list
-                    })
-
-                    # Update room allocation for this exam date (mark it as filled for the day)
-                    room_allocation_by_date[exam_date][room_name] += len(assigned_students)
-
-                    students = students.iloc[max_course_capacity:]  # Remove assigned students from the list
-                    num_students -= len(assigned_students)  # Update the number of remaining students
-
-                if num_students <= 0:
-                    break  # Stop if all students are assigned
             if num_students <= 0:
                 break  # Stop if all students are assigned
 
-    # Sort seating plan by Date in ascending order (from the earliest to latest)
-    seating_plan_sorted = sorted(seating_plan, key=lambda x: datetime.strptime(x['Date'], '%d/%m/%Y'))
-    return seating_plan_sorted  # Return the sorted seating plan
+    return assignments[:num_assignments]
+
 
-def save_seating_plan(seating_plan):
+def _assign_dense(course_sizes, course_dates, room_codes, room_capacities, num_dates):
     """
-    Save the seating plan in CSV and Excel formats.
+    Vectorized equivalent of _assign for dense seating with distinct room codes.
+
+    With dense seating every course fills the first rooms that still have seats, so on each date the
+    courses' students form one stream poured into the rooms in priority order. The assignments are the
+    pieces of that stream cut at both course and room boundaries, found with np.cumsum/np.searchsorted.
     """
-    seating_df = pd.DataFrame(seating_plan)
+    room_ends = np.cumsum(np.maximum(room_capacities, 0))  # Full rooms (capacity <= buffer) take no one
+    total_seats = room_ends[-1] if room_ends.size else 0
+    assignments = []
 
-    # Save as CSV (semicolon-separated, as requested)
-    seating_csv_filename = "seating_plan.csv"
-    seating_df.to_csv(seating_csv_filename, sep=';', index=False)
+    for date in range(num_dates):
+        courses = np.flatnonzero(course_dates == date)
+        course_ends = np.cumsum(course_sizes[courses])
+        seated = min(course_ends[-1], total_seats)  # Students beyond the last seat stay unassigned
 
-    # Save as Excel
-    seating_excel_filename = "seating_plan.xlsx"
-    seating_df.to_excel(seating_excel_filename, index=False)
+        # Every point where a course or a room starts or ends splits the stream into one assignment
+        cuts = np.union1d(course_ends, room_ends)
+        cuts = np.concatenate(([0], cuts[cuts < seated], [seated]))
+        starts, counts = cuts[:-1], np.diff(cuts)
+        starts, counts = starts[counts > 0], counts[counts > 0]
 
-    print(f"Files saved:\n- {seating_csv_filename}\n- {seating_excel_filename}")
+        course_pos = np.searchsorted(course_ends, starts, side='right')
+        room_pos = np.searchsorted(room_ends, starts, side='right')
+        offsets = starts - (course_ends[course_pos] - course_sizes[courses[course_pos]])
+        assignments.append(np.column_stack((courses[course_pos], room_codes[room_pos], offsets, counts)))
 
-    # Offer files for download
-    files.download(seating_csv_filename)
-    files.download(seating_excel_filename)
+    return np.concatenate(assignments) if assignments else np.empty((0, 4), dtype=np.int64)
+
+
+def allocate_seating_with_optimization(ip_1, ip_2, ip_3, buffer_size=5, seating_type='dense'):
+    if seating_type not in ('dense', 'sparse'):
+        raise ValueError("Invalid seating type. Choose 'dense' or 'sparse'.")
+
+    seating_plan = []  # List of (Date, Day, course_code, Room, count, roll list) rows, one per room assignment
+    # Roll numbers of each course as a string array, built once (courses in code order)
+    course_to_rolls = {course: group['roll_no'].astype(str).to_numpy() for course, group in ip_1.groupby('course', observed=True)}
+    # Sorting courses by size (largest first); the same sort_values as groupby('course').size() over the same
+    # code-ordered sizes, so equal-sized courses keep the baseline order
+    course_sizes = pd.Series([rolls.size for rolls in course_to_rolls.values()], index=list(course_to_rolls),
+                             dtype=np.int64).sort_values(ascending=False)
+    sorted_courses = course_sizes.index.tolist()
+    course_sizes = course_sizes.to_numpy()
+    room_groups = ip_3.groupby('block', observed=True)  # Grouping rooms by their blocks (e.g., Block 9, LT)
+
+    prioritized_blocks = ['Block 9', 'LT']  # Blocks to prioritize when assigning rooms
+    room_names = ip_3['room_name'].to_numpy()
+    room_idx = {room_name: i for i, room_name in enumerate(room_names)}  # Integer code for each room
+
+    # Extract each block's rooms (largest first) once as (room code, capacity) rows
+    block_rooms = {
+        block: group.sort_values(by='capacity', ascending=False)
+                    .assign(room_code=lambda rooms: rooms['room_name'].map(room_idx))
+                    [['room_code', 'capacity']].to_numpy(dtype=np.int64)
+        for block, group in room_groups
+    }
+    # Rooms are tried block by block in priority order, so lay them out as one flat sequence
+    prioritized_rooms = [rooms for rooms in map(block_rooms.get, prioritized_blocks) if rooms is not None]
+    prioritized_rooms = np.concatenate(prioritized_rooms) if prioritized_rooms else np.empty((0, 2), dtype=np.int64)
+
+    # Parse every exam date once (no-op if already parsed) and map course -> date (first listing wins, as before)
+    exam_dates = ip_2.drop_duplicates(subset='course')
+    course_to_date = dict(zip(exam_dates['course'], pd.to_datetime(exam_dates['exam_date'], format='%d/%m/%Y').dt.date))
+
+    # Integer date codes in chronological order, so ordering by code orders by date
+    date_codes = {exam_date: i for i, exam_date in
+                  enumerate(sorted({course_to_date[course] for course in sorted_courses if course in course_to_date}))}
+    # Date code for each course (-1 when it has no exam date)
+    course_dates = np.array([date_codes.get(course_to_date.get(course), -1) for course in sorted_courses], dtype=np.int64)
+
+    room_codes, room_capacities = prioritized_rooms[:, 0], prioritized_rooms[:, 1] - buffer_size
+    if seating_type == 'dense' and np.unique(room_codes).size == room_codes.size:
+        assignments = _assign_dense(course_sizes, course_dates, room_codes, room_capacities, len(date_codes))
+    else:
+        # Sparse seating halves whatever is left in each room, so it needs the step-by-step greedy
+        assignments = _assign(
+            course_sizes, course_dates, room_codes, room_capacities,
+            len(date_codes), len(room_names), seating_type == 'sparse'
+        )
+    # Sort seating plan by Date in ascending order; the stable sort keeps course order within a date
+    assignments = assignments[np.argsort(course_dates[assignments[:, 0]], kind='stable')]
+
+    # Format each exam date and its day of the week once
+    date_labels = {code: (exam_date.strftime('%d/%m/%Y'), exam_date.strftime('%A')) for exam_date, code in date_codes.items()}
+
+    for course_pos, room_code, offset, count in assignments.tolist():
+        course = sorted_courses[course_pos]
+        date_str, day_str = date_labels[course_dates[course_pos]]
+        # Format the roll numbers as a semicolon-separated string
+        roll_list = ';'.join(course_to_rolls[course][offset:offset + count].tolist())
+        seating_plan.append((date_str, day_str, course, room_names[room_code], count, roll_list))
+
+    return seating_plan  # Return the sorted seating plan
 
 # Main function
 if __name__ == "__main__":
@@ -173,7 +256,9 @@ if __name__ == "__main__":
             )
 
             # Step 3: Save output in both CSV and Excel formats
-            save_seating_plan(seating_plan)
+            save_seating_plan(seating_plan, "seating_plan.csv", "seating_plan.xlsx", offer_download=IN_COLAB)
 
         except ValueError as e:
             print(f"Input error: {e}")
+        except ImportError as e:
+            print(f"Excel output error: {e}. Install xlsxwriter or openpyxl to save seating_plan.xlsx.")